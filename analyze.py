@@ -1,33 +1,272 @@
+import argparse
+import hashlib
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
 import pandas as pd
 
-df = pd.read_csv('players.csv')
-print('Player price stats:')
-print(df['Price'].describe())
-print()
-
-print('Position price ranges:')
-for pos in ['QB','RB','WR','TE','K','DEF']:
-    pos_df = df[df['Position']==pos]
-    print(f'{pos}: {len(pos_df)} players, ${pos_df["Price"].min():.0f}-${pos_df["Price"].max():.0f}')
-
-print()
-print('Sample team cost calculation:')
-print('1 QB (cheapest): $', df[df['Position']=='QB']['Price'].min())
-print('1 RB (cheapest): $', df[df['Position']=='RB']['Price'].min()) 
-print('2 WR (cheapest): $', df[df['Position']=='WR']['Price'].min() * 2)
-print('1 TE (cheapest): $', df[df['Position']=='TE']['Price'].min())
-print('1 K (cheapest): $', df[df['Position']=='K']['Price'].min())
-print('1 DEF (cheapest): $', df[df['Position']=='DEF']['Price'].min())
-print('2 FLEX (cheapest RB): $', df[df['Position']=='RB']['Price'].min() * 2)
-print('5 BENCH (cheapest): $', df.nsmallest(5, 'Price')['Price'].sum())
-
-min_cost = (df[df['Position']=='QB']['Price'].min() + 
-           df[df['Position']=='RB']['Price'].min() + 
-           df[df['Position']=='WR']['Price'].min() * 2 +
-           df[df['Position']=='TE']['Price'].min() + 
-           df[df['Position']=='K']['Price'].min() + 
-           df[df['Position']=='DEF']['Price'].min() +
-           df[df['Position']=='RB']['Price'].min() * 2 +
-           df.nsmallest(5, 'Price')['Price'].sum())
-
-print(f'Minimum possible team cost: ${min_cost:.0f}')
+from player_pool import (
+    BENCH_SLOTS, FLEX_POSITIONS, FLEX_SLOTS, PLAYERS_CSV, POSITIONS,
+    REQUIRED_SLOTS, TIER_BOUNDARIES, read_player_pool
+)
+
+QUANTILES = [0.25, 0.5, 0.75]
+ROW_COLUMNS = ['Name', 'Position', 'Price']
+
+
+def row_hashes(players_df: pd.DataFrame) -> np.ndarray:
+    """Stable per-row hash of the columns the analytics depend on"""
+    return pd.util.hash_pandas_object(players_df[ROW_COLUMNS], index=False).to_numpy()
+
+
+def data_fingerprint(hashes) -> str:
+    """Order-independent fingerprint of a set of row hashes"""
+    return hashlib.sha256(np.sort(np.asarray(hashes, dtype=np.uint64)).tobytes()).hexdigest()
+
+
+def tier_sizes(count: int, boundaries: List[int]) -> List[int]:
+    """Number of players in each tier given a position's pool size"""
+    edges = [0] + [min(b, count) for b in boundaries] + [count]
+    sizes = [hi - lo for lo, hi in zip(edges, edges[1:])]
+    # Players ranked past the last boundary only form a tier if there are any
+    return sizes if sizes[-1] else sizes[:-1]
+
+
+def roster_cost_bounds(prices: Dict[str, np.ndarray]) -> Tuple[float, float]:
+    """Cheapest and most expensive roster that satisfies the lineup rules (NaN if none)"""
+    def roster_cost(pick):
+        total = 0.0
+        extras = []
+        for pos, count in REQUIRED_SLOTS.items():
+            pos_prices = pick(np.asarray(prices.get(pos, []), dtype=float))
+            if len(pos_prices) < count:
+                return float('nan')
+            total += pos_prices[:count].sum()
+            if pos in FLEX_POSITIONS:
+                extras.append(pos_prices[count:])
+        extras = np.sort(np.concatenate(extras))
+        open_slots = FLEX_SLOTS + BENCH_SLOTS
+        if len(extras) < open_slots:
+            return float('nan')
+        return float(total + pick(extras)[:open_slots].sum())
+
+    return roster_cost(lambda p: p), roster_cost(lambda p: p[::-1])
+
+
+def _group_rank(sorted_values: np.ndarray) -> np.ndarray:
+    """0-based rank of each element within its run of equal values"""
+    n = len(sorted_values)
+    if not n:
+        return np.empty(0, dtype=np.int64)
+    starts = np.r_[True, sorted_values[1:] != sorted_values[:-1]]
+    return np.arange(n) - np.maximum.accumulate(np.where(starts, np.arange(n), 0))
+
+
+def _counts_in(keys: np.ndarray, other_keys: np.ndarray, other_counts: np.ndarray) -> np.ndarray:
+    """How often each of keys occurs in another (sorted, unique) key/count multiset"""
+    if not len(other_keys):
+        return np.zeros(len(keys), dtype=np.int64)
+    idx = np.minimum(np.searchsorted(other_keys, keys), len(other_keys) - 1)
+    return np.where(other_keys[idx] == keys, other_counts[idx], 0)
+
+
+class PoolAnalytics:
+    """Per-position price statistics for a player pool, maintainable row by row"""
+
+    # sync() rebuilds from scratch instead once more than this share of rows differ
+    MAX_SYNC_FRACTION = 0.5
+
+    def __init__(self):
+        self.prices: Dict[str, np.ndarray] = {pos: np.empty(0) for pos in POSITIONS}
+        # Row hashes in sorted order, with each row's position and price alongside
+        self._hashes = np.empty(0, dtype=np.uint64)
+        self._row_positions = np.empty(0, dtype=object)
+        self._row_prices = np.empty(0)
+        self._summary: Optional[dict] = None
+
+    @classmethod
+    def from_frame(cls, players_df: pd.DataFrame, hashes: Optional[np.ndarray] = None) -> 'PoolAnalytics':
+        """Build from a DataFrame in a single grouped pass (hashes from row_hashes() may be passed in)"""
+        analytics = cls()
+        for pos, group in players_df.groupby('Position', sort=False)['Price']:
+            analytics.prices[pos] = np.sort(group.to_numpy(dtype=float))
+        if hashes is None:
+            hashes = row_hashes(players_df)
+        order = np.argsort(hashes, kind='stable')
+        analytics._hashes = hashes[order]
+        analytics._row_positions = players_df['Position'].to_numpy(dtype=object)[order]
+        analytics._row_prices = players_df['Price'].to_numpy(dtype=float)[order]
+        return analytics
+
+    def copy(self) -> 'PoolAnalytics':
+        """Independent copy, so cached entries are never changed in place"""
+        analytics = PoolAnalytics()
+        analytics.prices = {pos: prices.copy() for pos, prices in self.prices.items()}
+        analytics._hashes = self._hashes.copy()
+        analytics._row_positions = self._row_positions.copy()
+        analytics._row_prices = self._row_prices.copy()
+        return analytics
+
+    @property
+    def fingerprint(self) -> str:
+        return data_fingerprint(self._hashes)
+
+    def add_rows(self, players_df: pd.DataFrame):
+        self._insert(row_hashes(players_df),
+                     players_df['Position'].to_numpy(dtype=object),
+                     players_df['Price'].to_numpy(dtype=float))
+
+    def remove_rows(self, players_df: pd.DataFrame):
+        self._delete(row_hashes(players_df))
+
+    def sync(self, players_df: pd.DataFrame, hashes: Optional[np.ndarray] = None) -> bool:
+        """
+        Apply only the rows that differ from players_df. Returns False without changing
+        anything if most rows differ, in which case from_frame() is cheaper.
+        """
+        if hashes is None:
+            hashes = row_hashes(players_df)
+        new_keys, new_counts = np.unique(hashes, return_counts=True)
+        old_keys, old_counts = np.unique(self._hashes, return_counts=True)
+
+        add_counts = new_counts - _counts_in(new_keys, old_keys, old_counts)
+        remove_counts = old_counts - _counts_in(old_keys, new_keys, new_counts)
+        added = add_counts > 0
+        removed = remove_counts > 0
+        changed = add_counts[added].sum() + remove_counts[removed].sum()
+        if not changed:
+            return True
+        if changed > self.MAX_SYNC_FRACTION * max(len(hashes), len(self._hashes)):
+            return False
+
+        # Rows of players_df holding the added hashes, keeping only as many
+        # duplicates of each as were actually added
+        added_keys = new_keys[added]
+        rows = np.flatnonzero(np.isin(hashes, added_keys))
+        rows = rows[np.argsort(hashes[rows], kind='stable')]
+        row_keys = hashes[rows]
+        rows = rows[_group_rank(row_keys) < add_counts[added][np.searchsorted(added_keys, row_keys)]]
+        added_rows = players_df.iloc[rows]
+
+        self._delete(np.repeat(old_keys[removed], remove_counts[removed]))
+        self._insert(hashes[rows],
+                     added_rows['Position'].to_numpy(dtype=object),
+                     added_rows['Price'].to_numpy(dtype=float))
+        return True
+
+    def _insert(self, hashes: np.ndarray, positions: np.ndarray, prices: np.ndarray):
+        order = np.argsort(hashes, kind='stable')
+        hashes, positions, prices = hashes[order], positions[order], prices[order]
+        idx = np.searchsorted(self._hashes, hashes)
+        self._hashes = np.insert(self._hashes, idx, hashes)
+        self._row_positions = np.insert(self._row_positions, idx, positions)
+        self._row_prices = np.insert(self._row_prices, idx, prices)
+        for pos in set(positions):
+            values = np.sort(prices[positions == pos])
+            pos_prices = self.prices.get(pos, np.empty(0))
+            self.prices[pos] = np.insert(pos_prices, np.searchsorted(pos_prices, values), values)
+        self._summary = None
+
+    def _delete(self, hashes: np.ndarray):
+        hashes = np.sort(hashes)
+        idx = np.searchsorted(self._hashes, hashes) + _group_rank(hashes)
+        positions, prices = self._row_positions[idx], self._row_prices[idx]
+        self._hashes = np.delete(self._hashes, idx)
+        self._row_positions = np.delete(self._row_positions, idx)
+        self._row_prices = np.delete(self._row_prices, idx)
+        for pos in set(positions):
+            values = np.sort(prices[positions == pos])
+            pos_prices = self.prices[pos]
+            self.prices[pos] = np.delete(pos_prices, np.searchsorted(pos_prices, values) + _group_rank(values))
+        self._summary = None
+
+    def summary(self) -> dict:
+        """Counts, price quantiles, tier sizes and roster cost bounds (memoized until rows change)"""
+        if self._summary is None:
+            all_prices = np.sort(np.concatenate([np.asarray(p, dtype=float) for p in self.prices.values()] or [np.empty(0)]))
+            positions = {}
+            for pos in POSITIONS:
+                pos_prices = np.asarray(self.prices.get(pos, []), dtype=float)
+                positions[pos] = {
+                    'count': len(pos_prices),
+                    'min': float(pos_prices[0]) if len(pos_prices) else float('nan'),
+                    'max': float(pos_prices[-1]) if len(pos_prices) else float('nan'),
+                    'quantiles': dict(zip(QUANTILES, np.quantile(pos_prices, QUANTILES).tolist()))
+                                 if len(pos_prices) else {},
+                    'tier_sizes': tier_sizes(len(pos_prices), TIER_BOUNDARIES[pos]),
+                }
+            self._summary = {
+                'count': len(all_prices),
+                'price': {
+                    'mean': float(all_prices.mean()) if len(all_prices) else float('nan'),
+                    'min': float(all_prices[0]) if len(all_prices) else float('nan'),
+                    'max': float(all_prices[-1]) if len(all_prices) else float('nan'),
+                    'quantiles': dict(zip(QUANTILES, np.quantile(all_prices, QUANTILES).tolist()))
+                                 if len(all_prices) else {},
+                },
+                'positions': positions,
+                'roster_cost': roster_cost_bounds(self.prices),
+            }
+        return self._summary
+
+
+# Analytics by data fingerprint, least recently used first. New pools start from
+# a copy of the most recent entry. Shared by all Streamlit sessions, hence the lock.
+_analytics_cache: Dict[str, PoolAnalytics] = {}
+_analytics_lock = threading.Lock()
+_ANALYTICS_CACHE_SIZE = 4
+
+
+def prime_analytics(analytics: PoolAnalytics):
+    """Register prebuilt analytics (e.g. from the warm-start cache)"""
+    with _analytics_lock:
+        _analytics_cache[analytics.fingerprint] = analytics
+
+
+def pool_analytics(players_df: pd.DataFrame) -> dict:
+    """Summary for players_df, reusing cached results for the same data"""
+    hashes = row_hashes(players_df)
+    fingerprint = data_fingerprint(hashes)
+    with _analytics_lock:
+        analytics = _analytics_cache.pop(fingerprint, None)
+        if analytics is None and _analytics_cache:
+            # Start from the most recent pool and apply only the changed rows
+            analytics = _analytics_cache[next(reversed(_analytics_cache))].copy()
+            if not analytics.sync(players_df, hashes):
+                analytics = None
+        if analytics is None:
+            analytics = PoolAnalytics.from_frame(players_df, hashes)
+        _analytics_cache[fingerprint] = analytics
+        while len(_analytics_cache) > _ANALYTICS_CACHE_SIZE:
+            del _analytics_cache[next(iter(_analytics_cache))]
+        return analytics.summary()
+
+
+def format_report(summary: dict) -> str:
+    price = summary['price']
+    lines = [f"Player price stats ({summary['count']} players):"]
+    lines.append(f"  mean ${price['mean']:.1f}, min ${price['min']:.0f}, max ${price['max']:.0f}, "
+                 + ", ".join(f"p{int(q * 100)} ${v:.0f}" for q, v in price['quantiles'].items()))
+    lines.append('')
+    lines.append('Position price ranges:')
+    for pos, stats in summary['positions'].items():
+        quantiles = ", ".join(f"p{int(q * 100)} ${v:.0f}" for q, v in stats['quantiles'].items())
+        tiers = ",".join(str(n) for n in stats['tier_sizes'])
+        lines.append(f"{pos}: {stats['count']} players, ${stats['min']:.0f}-${stats['max']:.0f} "
+                     f"({quantiles}) tiers {tiers}")
+    lines.append('')
+    min_cost, max_cost = summary['roster_cost']
+    lines.append(f"Feasible roster cost: ${min_cost:.0f}-${max_cost:.0f}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Player pool analytics report")
+    parser.add_argument('--csv', default=PLAYERS_CSV, help="Player CSV to analyze")
+    args = parser.parse_args()
+    print(format_report(pool_analytics(read_player_pool(args.csv))))
+
+
+if __name__ == "__main__":
+    main()
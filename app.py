@@ -1,8 +1,18 @@
+import time
+
+# Taken before the heavy imports so the first run's import cost is included
+SCRIPT_STARTED_AT = time.perf_counter()
+
+import os
+import tempfile
+
 import streamlit as st
 import pandas as pd
-import numpy as np
-from typing import Dict, List, Tuple
-import random
+
+from analyze import pool_analytics, prime_analytics
+from player_pool import (
+    PLAYERS_CSV, TIER_BOUNDARIES, load_warm_cache, record_first_render
+)
 
 # Page config
 st.set_page_config(
@@ -108,180 +118,12 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-class FantasyOptimizer:
-    def __init__(self, players_df: pd.DataFrame, budget: float = 200.0):
-        self.players_df = players_df
-        self.budget = budget
-        
-        # Lineup requirements
-        self.lineup_requirements = {
-            'QB': 1,
-            'RB': 1,  # 1 required RB + 2 FLEX (can be RB)
-            'WR': 2,  # 2 required WR + 2 FLEX (can be WR)
-            'TE': 1,  # 1 required TE + 2 FLEX (can be TE)
-            'K': 1,
-            'DEF': 1,
-            'FLEX': 2,  # RB/WR/TE eligible
-            'BENCH': 5  # Any position
-        }
-        
-    def get_players_by_position(self) -> Dict[str, pd.DataFrame]:
-        """Get players grouped by position"""
-        return {pos: self.players_df[self.players_df['Position'] == pos] 
-                for pos in ['QB', 'RB', 'WR', 'TE', 'K', 'DEF']}
-    
-    def randomize_player_selection(self, df: pd.DataFrame, top_n: int = 10) -> pd.DataFrame:
-        """Randomize player selection from top performers to create variety"""
-        df_copy = df.copy().sort_values('Price', ascending=True)
-        # Take top players by price efficiency but add some randomization
-        if len(df_copy) > top_n:
-            top_players = df_copy.head(top_n)
-            return top_players.sample(frac=1).reset_index(drop=True)
-        return df_copy.sample(frac=1).reset_index(drop=True)
-    
-    def optimize_team_greedy(self) -> Tuple[List[Dict], float]:
-        """
-        Simple team selection - just fill all positions and try to get close to budget
-        """
-        players_by_pos = self.get_players_by_position()
-        
-        best_team = None
-        best_cost = 0
-        max_attempts = 100  # Reduce attempts since logic is simpler
-        
-        for attempt in range(max_attempts):
-            selected_players = []
-            total_cost = 0.0
-            selected_names = set()
-            
-            # Fill required positions first
-            required_positions = [
-                ('QB', 1), ('RB', 1), ('WR', 2), ('TE', 1), ('K', 1), ('DEF', 1)
-            ]
-            
-            success = True
-            for pos, count in required_positions:
-                pos_players = players_by_pos[pos]
-                available_players = pos_players[~pos_players['Name'].isin(selected_names)]
-                
-                if len(available_players) < count:
-                    success = False
-                    break
-                
-                # Apply top_players_count filter if set
-                top_count = getattr(self, 'top_players_count', 0)
-                if top_count > 0 and len(available_players) > top_count:
-                    # Sort by price descending and take top N
-                    available_players = available_players.sort_values('Price', ascending=False).head(top_count)
-                
-                # Randomize selection from available options
-                chosen_players = available_players.sample(n=count, replace=False)
-                
-                for _, player in chosen_players.iterrows():
-                    selected_players.append({
-                        'Name': player['Name'],
-                        'Position': player['Position'], 
-                        'Role': pos,
-                        'Price': player['Price']
-                    })
-                    total_cost += player['Price']
-                    selected_names.add(player['Name'])
-            
-            if not success:
-                continue
-                
-            # Fill FLEX positions (2 spots from RB/WR/TE)
-            flex_eligible = pd.concat([
-                players_by_pos['RB'],
-                players_by_pos['WR'], 
-                players_by_pos['TE']
-            ])
-            
-            available_flex = flex_eligible[~flex_eligible['Name'].isin(selected_names)]
-            if len(available_flex) < 2:
-                continue
-                
-            # Apply top_players_count filter for FLEX
-            top_count = getattr(self, 'top_players_count', 0)
-            if top_count > 0 and len(available_flex) > top_count:
-                available_flex = available_flex.sort_values('Price', ascending=False).head(top_count)
-            
-            chosen_flex = available_flex.sample(n=2, replace=False)
-            for _, player in chosen_flex.iterrows():
-                selected_players.append({
-                    'Name': player['Name'],
-                    'Position': player['Position'],
-                    'Role': 'FLEX', 
-                    'Price': player['Price']
-                })
-                total_cost += player['Price']
-                selected_names.add(player['Name'])
-            
-            # Fill BENCH (5 spots from any position)
-            all_available = self.players_df[~self.players_df['Name'].isin(selected_names)]
-            if len(all_available) < 5:
-                continue
-                
-            # Apply bench max cost filter
-            bench_max = getattr(self, 'bench_max', 50)
-            bench_candidates = all_available[all_available['Price'] <= bench_max]
-            
-            # If not enough under bench_max, use all available
-            if len(bench_candidates) < 5:
-                bench_candidates = all_available
-                
-            # Sort by price ascending (prefer cheaper for bench)
-            bench_candidates = bench_candidates.sort_values('Price', ascending=True)
-            
-            # Take first 5 that fit
-            chosen_bench = bench_candidates.head(5)
-            for _, player in chosen_bench.iterrows():
-                selected_players.append({
-                    'Name': player['Name'],
-                    'Position': player['Position'],
-                    'Role': 'BENCH',
-                    'Price': player['Price']
-                })
-                total_cost += player['Price']
-                selected_names.add(player['Name'])
-            
-            # Check if team is complete and within budget constraints
-            min_budget = getattr(self, 'min_budget', 100)
-            if (len(selected_players) == 14 and 
-                total_cost > min_budget and 
-                total_cost < self.budget and
-                total_cost > best_cost):
-                
-                # Verify position requirements
-                position_counts = {}
-                for player in selected_players:
-                    pos = player['Position']
-                    position_counts[pos] = position_counts.get(pos, 0) + 1
-                
-                if (position_counts.get('QB', 0) == 1 and
-                    position_counts.get('K', 0) == 1 and 
-                    position_counts.get('DEF', 0) == 1):
-                    best_team = selected_players
-                    best_cost = total_cost
-        
-        return best_team if best_team else [], best_cost
-
 def get_player_tier(players_df, player_name, position):
     """Calculate which tier a player belongs to based on position and price rank"""
     pos_players = players_df[players_df['Position'] == position].sort_values('Price', ascending=False).reset_index(drop=True)
     player_idx = pos_players[pos_players['Name'] == player_name].index[0]
     
-    # Define tier boundaries for each position
-    tier_boundaries = {
-        'QB': [5, 16, 28],  # Tiers: 1-5, 6-16, 17-28
-        'RB': [7, 13, 35, 60],  # Tiers: 1-7, 8-13, 14-35, 36-60
-        'WR': [1, 8, 13, 21, 44, 75],  # Tiers: 1, 2-8, 9-13, 14-21, 22-44, 45-75
-        'TE': [5, 17, 29],  # Tiers: 1-5, 6-17, 18-29
-        'K': [3, 16],  # Tiers: 1-3, 4-16
-        'DEF': [3, 16]  # Tiers: 1-3, 4-16
-    }
-    
-    boundaries = tier_boundaries.get(position, [])
+    boundaries = TIER_BOUNDARIES.get(position, [])
     tier = 1
     for boundary in boundaries:
         if player_idx >= boundary:
@@ -291,17 +133,10 @@ def get_player_tier(players_df, player_name, position):
     
     return tier
 
-def get_tier_options(position):
+def get_tier_options(players_df, position):
     """Get available tier options for a position"""
-    tier_counts = {
-        'QB': 3,  # 3 tiers
-        'RB': 4,  # 4 tiers  
-        'WR': 6,  # 6 tiers
-        'TE': 3,  # 3 tiers
-        'K': 2,   # 2 tiers
-        'DEF': 2  # 2 tiers
-    }
-    return list(range(1, tier_counts.get(position, 3) + 1))
+    tier_sizes = pool_analytics(players_df)['positions'][position]['tier_sizes']
+    return list(range(1, len(tier_sizes) + 1))
 
 def start_new_game(players_df):
     """Start a new guess the tier game"""
@@ -311,29 +146,102 @@ def start_new_game(players_df):
     
     random_player = eligible_players.sample(1).iloc[0]
     
+    # Use the prebuilt tier table, falling back to ranking on the fly
+    tier = load_warm_start()['tiers'].get((random_player['Name'], random_player['Position']))
+    if tier is None:
+        tier = get_player_tier(players_df, random_player['Name'], random_player['Position'])
+    
     st.session_state.current_player = {
         'name': random_player['Name'],
         'position': random_player['Position'],
         'price': random_player['Price'],
-        'tier': get_player_tier(players_df, random_player['Name'], random_player['Position'])
+        'tier': tier
     }
     st.session_state.show_answer = False
     st.session_state.game_active = True
     st.session_state.last_result = None  # Reset color to normal for new player
 
+@st.cache_resource
+def load_warm_start(file_path: str = PLAYERS_CSV) -> dict:
+    """Load the prebuilt player pool, tier table and pool analytics (shared across sessions)"""
+    cache = load_warm_cache(file_path)
+    prime_analytics(cache['analytics'])
+    return cache
+
 @st.cache_data
-def load_player_data(file_path: str = "players.csv") -> pd.DataFrame:
-    """Load player data from CSV file (fallback)"""
+def load_player_data(file_path: str = PLAYERS_CSV) -> pd.DataFrame:
+    """Load player data from the warm-start cache (built from the CSV file)"""
     try:
-        df = pd.read_csv(file_path)
-        # Remove ProjectedPoints if it exists
-        if 'ProjectedPoints' in df.columns:
-            df = df.drop('ProjectedPoints', axis=1)
-        return df
+        return load_warm_start(file_path)['players']
     except FileNotFoundError:
         st.error(f"Player data file '{file_path}' not found. Please ensure the file exists in the current directory.")
         return pd.DataFrame()
 
+# Upper bound on one export. The finished file (about 2.5 MB of CSV at the cap)
+# is handed to st.download_button, which keeps the bytes in Streamlit's
+# in-memory media store until the next rerun.
+MAX_EXPORT_LINEUPS = 10000
+
+def render_bulk_export(players_df, budget, min_budget, bench_max, top_players_count):
+    """Generate lineups into a temp file chunk by chunk, then offer it for download once"""
+    from export import EXPORT_FORMATS
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        lineup_count = st.number_input(
+            "Lineups", min_value=1, max_value=MAX_EXPORT_LINEUPS, value=150, step=1,
+            help="Thousands of lineups can take a few minutes to generate"
+        )
+    with col2:
+        export_format = st.selectbox("Format", list(EXPORT_FORMATS))
+    with col3:
+        build_clicked = st.button("📥 Build Export", use_container_width=True)
+    
+    # Only the run that built the file registers a download, so later reruns
+    # don't copy it into memory again
+    if not build_clicked:
+        return
+    
+    from optimizer import FantasyOptimizer
+    optimizer = FantasyOptimizer(players_df, budget)
+    optimizer.min_budget = min_budget
+    optimizer.top_players_count = top_players_count
+    optimizer.bench_max = bench_max
+    
+    export_fn, mime = EXPORT_FORMATS[export_format]
+    mode = 'w' if export_format == 'csv' else 'wb'
+    newline = '' if export_format == 'csv' else None
+    progress = st.progress(0.0, text=f"Generating {lineup_count} lineups (large exports take a few minutes)...")
+    
+    def with_progress(rosters):
+        for i, players in enumerate(rosters, start=1):
+            if i % 50 == 0 or i == lineup_count:
+                progress.progress(i / lineup_count, text=f"Generated {i} of {lineup_count} lineups")
+            yield players
+    
+    f = tempfile.NamedTemporaryFile(mode, suffix=f".{export_format}", newline=newline, delete=False)
+    try:
+        with f:
+            written = export_fn(with_progress(optimizer.iter_teams(lineup_count)), f)
+        progress.empty()
+        if written == 0:
+            st.error("Could not find valid teams within budget constraints.")
+            return
+        if written < lineup_count:
+            st.warning(f"Only found {written} distinct lineups within budget constraints.")
+        with open(f.name, 'rb') as exported:
+            data = exported.read()
+    finally:
+        os.remove(f.name)
+    
+    st.download_button(
+        f"Download {written} lineups ({export_format.upper()})",
+        data=data,
+        file_name=f"lineups.{export_format}",
+        mime=mime,
+        use_container_width=True
+    )
+
 def main():
     # Initialize session state for teams list if it doesn't exist
     if 'teams' not in st.session_state:
@@ -355,6 +263,9 @@ def main():
     if 'debug_password_entered' not in st.session_state:
         st.session_state.debug_password_entered = False
     
+    # Load player data automatically (tier controls are sized from it)
+    players_df = load_player_data()
+    
     # Sidebar for tier minimum settings
     with st.sidebar:
         # Debug mode section at the top
@@ -386,52 +297,36 @@ def main():
         # Create tier minimum controls for each position
         tier_mins = {}
         
-        # QB: Tiers 1(5), 2(11), 3(12)
-        st.subheader("QB (5,11,12)")
-        tier_mins['QB_T1'] = st.number_input("QB T1 Min", min_value=0, max_value=5, value=0, step=1, help="Min from top 5 QBs")
-        tier_mins['QB_T2'] = st.number_input("QB T2 Min", min_value=0, max_value=11, value=0, step=1, help="Min from next 11 QBs")
-        tier_mins['QB_T3'] = st.number_input("QB T3 Min", min_value=0, max_value=12, value=0, step=1, help="Min from remaining 12 QBs")
-        
-        # RB: Tiers 1(7), 2(6), 3(22), 4(25)
-        st.subheader("RB (7,6,22,25)")
-        tier_mins['RB_T1'] = st.number_input("RB T1 Min", min_value=0, max_value=7, value=0, step=1, help="Min from top 7 RBs")
-        tier_mins['RB_T2'] = st.number_input("RB T2 Min", min_value=0, max_value=6, value=0, step=1, help="Min from next 6 RBs")
-        tier_mins['RB_T3'] = st.number_input("RB T3 Min", min_value=0, max_value=22, value=0, step=1, help="Min from next 22 RBs")
-        tier_mins['RB_T4'] = st.number_input("RB T4 Min", min_value=0, max_value=25, value=0, step=1, help="Min from remaining 25 RBs")
-        
-        # WR: Tiers 1(1), 2(7), 3(5), 4(8), 5(23), 6(31)
-        st.subheader("WR (1,7,5,8,23,31)")
-        tier_mins['WR_T1'] = st.number_input("WR T1 Min", min_value=0, max_value=1, value=0, step=1, help="Min from top 1 WR")
-        tier_mins['WR_T2'] = st.number_input("WR T2 Min", min_value=0, max_value=7, value=0, step=1, help="Min from next 7 WRs")
-        tier_mins['WR_T3'] = st.number_input("WR T3 Min", min_value=0, max_value=5, value=0, step=1, help="Min from next 5 WRs")
-        tier_mins['WR_T4'] = st.number_input("WR T4 Min", min_value=0, max_value=8, value=0, step=1, help="Min from next 8 WRs")
-        tier_mins['WR_T5'] = st.number_input("WR T5 Min", min_value=0, max_value=23, value=0, step=1, help="Min from next 23 WRs")
-        tier_mins['WR_T6'] = st.number_input("WR T6 Min", min_value=0, max_value=31, value=0, step=1, help="Min from remaining 31 WRs")
-        
-        # TE: Tiers 1(5), 2(12), 3(12)
-        st.subheader("TE (5,12,12)")
-        tier_mins['TE_T1'] = st.number_input("TE T1 Min", min_value=0, max_value=5, value=0, step=1, help="Min from top 5 TEs")
-        tier_mins['TE_T2'] = st.number_input("TE T2 Min", min_value=0, max_value=12, value=0, step=1, help="Min from next 12 TEs")
-        tier_mins['TE_T3'] = st.number_input("TE T3 Min", min_value=0, max_value=12, value=0, step=1, help="Min from remaining 12 TEs")
+        pool_stats = pool_analytics(players_df)['positions'] if not players_df.empty else {}
+        for pos in ['QB', 'RB', 'WR', 'TE']:
+            if pos not in pool_stats:
+                continue
+            sizes = pool_stats[pos]['tier_sizes']
+            st.subheader(f"{pos} ({','.join(str(n) for n in sizes)})")
+            for tier, size in enumerate(sizes, start=1):
+                if tier == 1:
+                    which = "top"
+                elif tier == len(sizes):
+                    which = "remaining"
+                else:
+                    which = "next"
+                plural = "" if size == 1 else "s"
+                tier_mins[f'{pos}_T{tier}'] = st.number_input(
+                    f"{pos} T{tier} Min", min_value=0, max_value=size, value=0, step=1,
+                    help=f"Min from {which} {size} {pos}{plural}"
+                )
     
     st.title("🏈 Fantasy Team Randomizer")
     st.markdown("**Build the optimal fantasy team within your budget!**")
     
-    # Load player data automatically
-    players_df = load_player_data()
-    
     if not players_df.empty:
         # Consolidate all debug info in one line
-        position_counts = players_df['Position'].value_counts()
-        tier_info = {
-            'QB': '5,11,12', 'RB': '7,6,22,25', 'WR': '1,7,5,8,23,31', 
-            'TE': '5,12,12', 'K': '3,13', 'DEF': '3,13'
-        }
+        pool_stats = pool_analytics(players_df)['positions']
         
         debug_parts = []
-        for pos in ['QB', 'RB', 'WR', 'TE', 'K', 'DEF']:
-            count = position_counts.get(pos, 0)
-            debug_parts.append(f"{pos}:{count}({tier_info[pos]})")
+        for pos, stats in pool_stats.items():
+            tier_info = ','.join(str(n) for n in stats['tier_sizes'])
+            debug_parts.append(f"{pos}:{stats['count']}({tier_info})")
         
         st.write(f"**Loaded {len(players_df)} players:** {' | '.join(debug_parts)}")
     else:
@@ -516,7 +411,8 @@ def main():
     #     st.info(f"📊 {len(st.session_state.teams)} team(s) generated")
     # 
     # if optimize_clicked:
-    #     # Pass all settings to optimizer
+    #     # Pass all settings to optimizer (imported here to keep cold start fast)
+    #     from optimizer import FantasyOptimizer
     #     optimizer = FantasyOptimizer(players_df, budget)
     #     optimizer.min_budget = min_budget  # Add min_budget to optimizer
     #     optimizer.top_players_count = top_players_count  # Add top players count
@@ -577,7 +473,7 @@ def main():
         
         if not st.session_state.show_answer:
             # Show tier options as buttons
-            tier_options = get_tier_options(player['position'])
+            tier_options = get_tier_options(players_df, player['position'])
             
             # Create buttons for each tier option
             cols = st.columns(len(tier_options))
@@ -612,6 +508,10 @@ def main():
         
         st.divider()
     
+    # Bulk lineup export for contest entry
+    with st.expander("📥 Bulk Lineup Export"):
+        render_bulk_export(players_df, budget, min_budget, bench_max, top_players_count)
+    
     # DEBUG: Hide team display for now
     # # Always display existing teams if any
     # if len(st.session_state.teams) > 0:
@@ -677,6 +577,10 @@ def main():
     #                     hide_index=True,
     #                     height=522
     #                 )
+    
+    render_seconds = record_first_render(SCRIPT_STARTED_AT)
+    if st.session_state.debug_mode:
+        st.caption(f"🔍 DEBUG: first render took {render_seconds * 1000:.0f} ms")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,76 @@
+import csv
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List
+
+from player_pool import BENCH_SLOTS, FLEX_SLOTS, REQUIRED_SLOTS
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def _slot_names(role: str, count: int) -> List[str]:
+    return [role] if count == 1 else [f"{role}{i}" for i in range(1, count + 1)]
+
+
+# Site upload format: one column per roster slot, in the order the optimizer fills them
+SLOT_COLUMNS = ([slot for role, count in REQUIRED_SLOTS.items() for slot in _slot_names(role, count)]
+                + _slot_names('FLEX', FLEX_SLOTS) + _slot_names('BENCH', BENCH_SLOTS))
+
+
+def lineup_row(players: List[Dict]) -> List[str]:
+    """Flatten one roster (as returned by FantasyOptimizer) into slot order"""
+    by_role: Dict[str, List[str]] = {}
+    for player in players:
+        by_role.setdefault(player['Role'], []).append(player['Name'])
+    row = []
+    for role, count in list(REQUIRED_SLOTS.items()) + [('FLEX', FLEX_SLOTS), ('BENCH', BENCH_SLOTS)]:
+        names = by_role.get(role, [])
+        if len(names) != count:
+            raise ValueError(f"Roster has {len(names)} {role} players, expected {count}")
+        row.extend(names)
+    return row
+
+
+def iter_lineup_chunks(rosters: Iterable[List[Dict]], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[List[str]]]:
+    """Group rosters into lists of upload rows without materializing the whole iterator"""
+    rosters = iter(rosters)
+    while True:
+        chunk = [lineup_row(players) for players in islice(rosters, chunk_size)]
+        if not chunk:
+            return
+        yield chunk
+
+
+def export_csv(rosters: Iterable[List[Dict]], out, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Write rosters to a CSV path or text file object; returns the number of lineups"""
+    if isinstance(out, str):
+        with open(out, 'w', newline='') as f:
+            return export_csv(rosters, f, chunk_size)
+
+    writer = csv.writer(out)
+    writer.writerow(SLOT_COLUMNS)
+    written = 0
+    for chunk in iter_lineup_chunks(rosters, chunk_size):
+        writer.writerows(chunk)
+        written += len(chunk)
+    return written
+
+
+def export_parquet(rosters: Iterable[List[Dict]], out, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Write rosters to a Parquet path or binary file object, one row group per chunk"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(column, pa.string()) for column in SLOT_COLUMNS])
+    written = 0
+    with pq.ParquetWriter(out, schema) as writer:
+        for chunk in iter_lineup_chunks(rosters, chunk_size):
+            columns = [pa.array(values, type=pa.string()) for values in zip(*chunk)]
+            writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+            written += len(chunk)
+    return written
+
+
+EXPORT_FORMATS = {
+    'csv': (export_csv, 'text/csv'),
+    'parquet': (export_parquet, 'application/vnd.apache.parquet'),
+}
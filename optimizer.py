@@ -0,0 +1,197 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from analyze import pool_analytics
+
+class FantasyOptimizer:
+    def __init__(self, players_df: pd.DataFrame, budget: float = 200.0):
+        self.players_df = players_df
+        self.budget = budget
+        
+        # Lineup requirements
+        self.lineup_requirements = {
+            'QB': 1,
+            'RB': 1,  # 1 required RB + 2 FLEX (can be RB)
+            'WR': 2,  # 2 required WR + 2 FLEX (can be WR)
+            'TE': 1,  # 1 required TE + 2 FLEX (can be TE)
+            'K': 1,
+            'DEF': 1,
+            'FLEX': 2,  # RB/WR/TE eligible
+            'BENCH': 5  # Any position
+        }
+        
+    def is_feasible(self) -> bool:
+        """Check the player pool can fill a roster inside the budget window at all"""
+        min_cost, max_cost = pool_analytics(self.players_df)['roster_cost']
+        if pd.isna(min_cost):
+            return False  # Not enough players for some position
+        min_budget = getattr(self, 'min_budget', 100)
+        return min_cost < self.budget and max_cost > min_budget
+    
+    def get_players_by_position(self) -> Dict[str, pd.DataFrame]:
+        """Get players grouped by position"""
+        return {pos: self.players_df[self.players_df['Position'] == pos] 
+                for pos in ['QB', 'RB', 'WR', 'TE', 'K', 'DEF']}
+    
+    def randomize_player_selection(self, df: pd.DataFrame, top_n: int = 10) -> pd.DataFrame:
+        """Randomize player selection from top performers to create variety"""
+        df_copy = df.copy().sort_values('Price', ascending=True)
+        # Take top players by price efficiency but add some randomization
+        if len(df_copy) > top_n:
+            top_players = df_copy.head(top_n)
+            return top_players.sample(frac=1).reset_index(drop=True)
+        return df_copy.sample(frac=1).reset_index(drop=True)
+    
+    def get_candidate_pool(self) -> Dict:
+        """Arrays used by build_candidate, computed once per search"""
+        names = self.players_df['Name'].to_numpy()
+        positions = self.players_df['Position'].to_numpy()
+        prices = self.players_df['Price'].to_numpy()
+        # Row indices per position, most expensive first (for the top-N filter)
+        by_pos = {pos: np.flatnonzero(positions == pos) for pos in ['QB', 'RB', 'WR', 'TE', 'K', 'DEF']}
+        by_pos = {pos: idx[np.argsort(-prices[idx], kind='stable')] for pos, idx in by_pos.items()}
+        flex = np.concatenate([by_pos['RB'], by_pos['WR'], by_pos['TE']])
+        return {
+            'names': names,
+            'positions': positions,
+            'prices': prices,
+            'by_pos': by_pos,
+            'flex_by_price_desc': flex[np.argsort(-prices[flex], kind='stable')],
+            'flex_by_price_asc': flex[np.argsort(prices[flex], kind='stable')],
+        }
+    
+    def build_candidate(self, pool: Dict) -> Tuple[List[Dict], float]:
+        """
+        One randomized attempt at a full roster; returns ([], 0) if a slot can't be filled
+        """
+        prices = pool['prices']
+        top_count = getattr(self, 'top_players_count', 0)
+        selected = []
+        roles = []
+        
+        # Fill required positions first
+        required_positions = [
+            ('QB', 1), ('RB', 1), ('WR', 2), ('TE', 1), ('K', 1), ('DEF', 1)
+        ]
+        
+        for pos, count in required_positions:
+            available_players = pool['by_pos'][pos]
+            available_players = available_players[~np.isin(available_players, selected)]
+            
+            if len(available_players) < count:
+                return [], 0
+            
+            # Apply top_players_count filter if set (already sorted by price descending)
+            if top_count > 0:
+                available_players = available_players[:top_count]
+            
+            # Randomize selection from available options
+            selected.extend(np.random.choice(available_players, size=count, replace=False))
+            roles.extend([pos] * count)
+        
+        # Fill FLEX positions (2 spots from RB/WR/TE)
+        available_flex = pool['flex_by_price_desc']
+        available_flex = available_flex[~np.isin(available_flex, selected)]
+        if len(available_flex) < 2:
+            return [], 0
+        
+        # Apply top_players_count filter for FLEX
+        if top_count > 0:
+            available_flex = available_flex[:top_count]
+        
+        selected.extend(np.random.choice(available_flex, size=2, replace=False))
+        roles.extend(['FLEX'] * 2)
+        
+        # Fill BENCH (5 spots). QB, K and DEF are capped at one per team, so
+        # the bench comes from the FLEX-eligible positions, cheapest first
+        all_available = pool['flex_by_price_asc']
+        all_available = all_available[~np.isin(all_available, selected)]
+        if len(all_available) < 5:
+            return [], 0
+        
+        # Apply bench max cost filter
+        bench_max = getattr(self, 'bench_max', 50)
+        bench_candidates = all_available[prices[all_available] <= bench_max]
+        
+        # If not enough under bench_max, use all available
+        if len(bench_candidates) < 5:
+            bench_candidates = all_available
+        
+        selected.extend(bench_candidates[:5])
+        roles.extend(['BENCH'] * 5)
+        
+        selected_players = [{
+            'Name': pool['names'][i],
+            'Position': pool['positions'][i],
+            'Role': role,
+            'Price': prices[i]
+        } for i, role in zip(selected, roles)]
+        return selected_players, float(prices[selected].sum())
+    
+    def is_valid_team(self, selected_players: List[Dict], total_cost: float) -> bool:
+        """Check a candidate is complete, inside the budget window and has one QB/K/DEF"""
+        min_budget = getattr(self, 'min_budget', 100)
+        if not (len(selected_players) == 14 and 
+                total_cost > min_budget and 
+                total_cost < self.budget):
+            return False
+        
+        # Verify position requirements
+        position_counts = {}
+        for player in selected_players:
+            pos = player['Position']
+            position_counts[pos] = position_counts.get(pos, 0) + 1
+        
+        return (position_counts.get('QB', 0) == 1 and
+                position_counts.get('K', 0) == 1 and 
+                position_counts.get('DEF', 0) == 1)
+    
+    def optimize_team_greedy(self) -> Tuple[List[Dict], float]:
+        """
+        Simple team selection - just fill all positions and try to get close to budget
+        """
+        if not self.is_feasible():
+            return [], 0
+        
+        pool = self.get_candidate_pool()
+        
+        best_team = None
+        best_cost = 0
+        max_attempts = 100  # Reduce attempts since logic is simpler
+        
+        for attempt in range(max_attempts):
+            selected_players, total_cost = self.build_candidate(pool)
+            if total_cost > best_cost and self.is_valid_team(selected_players, total_cost):
+                best_team = selected_players
+                best_cost = total_cost
+        
+        return best_team if best_team else [], best_cost
+    
+    def iter_teams(self, count: int, max_attempts: Optional[int] = None) -> Iterator[List[Dict]]:
+        """
+        Yield up to count distinct rosters one at a time, for bulk export without holding them all.
+        Each roster is a single randomized attempt rather than a best-of-100 search.
+        Gives up after max_attempts candidates in total (default 40 per requested roster).
+        Rosters are not kept, but the set used to drop duplicates holds one frozenset of
+        names per yielded roster, so that part of memory grows with count.
+        """
+        if not self.is_feasible():
+            return
+        
+        pool = self.get_candidate_pool()
+        if max_attempts is None:
+            max_attempts = count * 40
+        
+        seen = set()
+        for attempt in range(max_attempts):
+            if len(seen) >= count:
+                return
+            selected_players, total_cost = self.build_candidate(pool)
+            if not self.is_valid_team(selected_players, total_cost):
+                continue
+            names = frozenset(player['Name'] for player in selected_players)
+            if names in seen:
+                continue
+            seen.add(names)
+            yield selected_players
@@ -0,0 +1,126 @@
+import argparse
+import hashlib
+import pickle
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Set once per process (Streamlit keeps imported modules alive across reruns)
+_first_render_seconds: Optional[float] = None
+
+PLAYERS_CSV = "players.csv"
+WARM_CACHE_PATH = "players.warm.pkl"
+WARM_CACHE_VERSION = 3
+
+POSITIONS = ['QB', 'RB', 'WR', 'TE', 'K', 'DEF']
+
+# Price-rank boundaries for each position (0-based rank where the next tier starts)
+TIER_BOUNDARIES = {
+    'QB': [5, 16, 28],  # Tiers: 1-5, 6-16, 17-28
+    'RB': [7, 13, 35, 60],  # Tiers: 1-7, 8-13, 14-35, 36-60
+    'WR': [1, 8, 13, 21, 44, 75],  # Tiers: 1, 2-8, 9-13, 14-21, 22-44, 45-75
+    'TE': [5, 17, 29],  # Tiers: 1-5, 6-17, 18-29
+    'K': [3, 16],  # Tiers: 1-3, 4-16
+    'DEF': [3, 16]  # Tiers: 1-3, 4-16
+}
+
+# Roster shape used by FantasyOptimizer. The optimizer only accepts teams with
+# exactly one QB, K and DEF, so FLEX and BENCH are effectively RB/WR/TE only.
+REQUIRED_SLOTS = {'QB': 1, 'RB': 1, 'WR': 2, 'TE': 1, 'K': 1, 'DEF': 1}
+FLEX_POSITIONS = ['RB', 'WR', 'TE']
+FLEX_SLOTS = 2
+BENCH_SLOTS = 5
+
+
+def read_player_pool(file_path: str = PLAYERS_CSV) -> pd.DataFrame:
+    """Read the player CSV (raises FileNotFoundError if missing)"""
+    df = pd.read_csv(file_path)
+    # Remove ProjectedPoints if it exists
+    if 'ProjectedPoints' in df.columns:
+        df = df.drop('ProjectedPoints', axis=1)
+    return df
+
+
+def build_tier_table(players_df: pd.DataFrame) -> Dict[Tuple[str, str], int]:
+    """Map (name, position) to tier for every player in one pass per position"""
+    tiers = {}
+    for pos in POSITIONS:
+        pos_players = players_df[players_df['Position'] == pos].sort_values('Price', ascending=False).reset_index(drop=True)
+        # A player's tier is 1 + the number of boundaries at or below their rank
+        pos_tiers = np.searchsorted(TIER_BOUNDARIES[pos], pos_players.index, side='right') + 1
+        for name, tier in zip(pos_players['Name'], pos_tiers):
+            tiers.setdefault((name, pos), int(tier))
+    return tiers
+
+
+def pool_fingerprint(file_path: str = PLAYERS_CSV) -> str:
+    """Content hash of the player CSV, used to invalidate the warm cache"""
+    with open(file_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def build_warm_cache(file_path: str = PLAYERS_CSV, cache_path: str = WARM_CACHE_PATH) -> dict:
+    """Build the player pool, tier table and pool analytics and write them to disk"""
+    from analyze import PoolAnalytics  # analyze depends on this module
+
+    players_df = read_player_pool(file_path)
+    analytics = PoolAnalytics.from_frame(players_df)
+    # Compute the memoized summary (tier sizes, roster cost bounds) now so it ships in the pickle
+    analytics.summary()
+    cache = {
+        'version': WARM_CACHE_VERSION,
+        'fingerprint': pool_fingerprint(file_path),
+        'players': players_df,
+        'tiers': build_tier_table(players_df),
+        'analytics': analytics,
+    }
+    try:
+        with open(cache_path, 'wb') as f:
+            pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        # Read-only filesystem: still usable in memory
+        pass
+    return cache
+
+
+def load_warm_cache(file_path: str = PLAYERS_CSV, cache_path: str = WARM_CACHE_PATH) -> dict:
+    """Load the prebuilt cache, rebuilding it if missing or out of date"""
+    try:
+        with open(cache_path, 'rb') as f:
+            cache = pickle.load(f)
+        if (cache.get('version') == WARM_CACHE_VERSION and
+                cache.get('fingerprint') == pool_fingerprint(file_path)):
+            return cache
+    except Exception:
+        # Missing, corrupt or built by other code/library versions: rebuild
+        pass
+    return build_warm_cache(file_path, cache_path)
+
+
+def record_first_render(started_at: float) -> Optional[float]:
+    """Record time from started_at (perf_counter) to the first completed render (once per process)"""
+    global _first_render_seconds
+    if _first_render_seconds is None:
+        _first_render_seconds = time.perf_counter() - started_at
+        print(f"[warm-start] time to first interactive render: {_first_render_seconds * 1000:.0f} ms", flush=True)
+    return _first_render_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prebuild the warm-start player cache")
+    parser.add_argument('--csv', default=PLAYERS_CSV, help="Player CSV to load")
+    parser.add_argument('--out', default=WARM_CACHE_PATH, help="Where to write the cache")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    cache = build_warm_cache(args.csv, args.out)
+    elapsed = (time.perf_counter() - started) * 1000
+    min_cost, max_cost = cache['analytics'].summary()['roster_cost']
+    print(f"Wrote {args.out}: {len(cache['players'])} players, {len(cache['tiers'])} tiered, "
+          f"roster cost ${min_cost:.0f}-${max_cost:.0f} ({elapsed:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
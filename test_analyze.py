@@ -0,0 +1,90 @@
+import pandas as pd
+
+import analyze
+from analyze import PoolAnalytics, pool_analytics
+
+
+def make_pool():
+    return pd.DataFrame([
+        {'Name': 'QB A', 'Position': 'QB', 'Price': 40},
+        {'Name': 'QB B', 'Position': 'QB', 'Price': 12},
+        {'Name': 'RB A', 'Position': 'RB', 'Price': 35},
+        {'Name': 'RB B', 'Position': 'RB', 'Price': 8},
+        {'Name': 'RB C', 'Position': 'RB', 'Price': 8},
+        {'Name': 'RB D', 'Position': 'RB', 'Price': 6},
+        {'Name': 'WR A', 'Position': 'WR', 'Price': 30},
+        {'Name': 'WR B', 'Position': 'WR', 'Price': 20},
+        {'Name': 'WR C', 'Position': 'WR', 'Price': 5},
+        {'Name': 'WR D', 'Position': 'WR', 'Price': 2},
+        {'Name': 'WR F', 'Position': 'WR', 'Price': 4},
+        {'Name': 'TE A', 'Position': 'TE', 'Price': 15},
+        {'Name': 'TE B', 'Position': 'TE', 'Price': 3},
+        {'Name': 'TE C', 'Position': 'TE', 'Price': 1},
+        {'Name': 'TE D', 'Position': 'TE', 'Price': 2},
+        {'Name': 'K A', 'Position': 'K', 'Price': 1},
+        {'Name': 'DEF A', 'Position': 'DEF', 'Price': 1},
+    ])
+
+
+def test_sync_matches_from_frame():
+    base = make_pool()
+    analytics = PoolAnalytics.from_frame(base)
+
+    changed = base.drop(index=[1, 7]).copy()  # removes
+    changed.loc[2, 'Price'] = 50  # price edit
+    changed = pd.concat([
+        changed,
+        base.loc[[3]],  # exact duplicate row
+        pd.DataFrame([{'Name': 'WR E', 'Position': 'WR', 'Price': 9}]),  # add
+    ], ignore_index=True)
+
+    assert analytics.sync(changed)
+    assert analytics.summary() == PoolAnalytics.from_frame(changed).summary()
+    assert analytics.fingerprint == PoolAnalytics.from_frame(changed).fingerprint
+
+    # Syncing back removes the duplicate and restores the original numbers
+    assert analytics.sync(base)
+    assert analytics.summary() == PoolAnalytics.from_frame(base).summary()
+    # Nothing to apply
+    assert analytics.sync(base)
+    assert analytics.fingerprint == PoolAnalytics.from_frame(base).fingerprint
+
+
+def test_sync_declines_when_most_rows_differ():
+    base = make_pool()
+    analytics = PoolAnalytics.from_frame(base)
+    changed = base.assign(Price=base['Price'] + 1)
+
+    assert not analytics.sync(changed)
+    assert analytics.summary() == PoolAnalytics.from_frame(base).summary()
+
+
+def test_pool_analytics_keeps_previous_entries():
+    analyze._analytics_cache.clear()
+    base = make_pool()
+    primed = PoolAnalytics.from_frame(base)
+    analyze.prime_analytics(primed)
+    before = primed.summary()
+
+    changed = base.drop(index=[0])
+    assert pool_analytics(changed) == PoolAnalytics.from_frame(changed).summary()
+    # The primed entry is still cached and was not modified in place
+    assert analyze._analytics_cache[primed.fingerprint] is primed
+    assert primed.summary() == before
+    assert pool_analytics(base) == before
+
+
+def test_pool_analytics_small_change_takes_sync_path(monkeypatch):
+    analyze._analytics_cache.clear()
+    base = make_pool()
+    pool_analytics(base)
+
+    changed = base.copy()
+    changed.loc[4, 'Price'] = 9
+    expected = PoolAnalytics.from_frame(changed).summary()
+
+    def no_rebuild(*args, **kwargs):
+        raise AssertionError("from_frame() called for a one-row change")
+
+    monkeypatch.setattr(PoolAnalytics, 'from_frame', no_rebuild)
+    assert pool_analytics(changed) == expected
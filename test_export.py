@@ -0,0 +1,54 @@
+import io
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from export import SLOT_COLUMNS, export_csv, export_parquet, lineup_row
+
+ROLES = ['QB', 'RB', 'WR', 'WR', 'TE', 'K', 'DEF', 'FLEX', 'FLEX'] + ['BENCH'] * 5
+
+
+def make_roster(i):
+    return [{'Name': f'P{i}_{j}', 'Position': role, 'Role': role, 'Price': 1}
+            for j, role in enumerate(ROLES)]
+
+
+def test_slot_columns():
+    assert SLOT_COLUMNS == ['QB', 'RB', 'WR1', 'WR2', 'TE', 'K', 'DEF', 'FLEX1', 'FLEX2',
+                            'BENCH1', 'BENCH2', 'BENCH3', 'BENCH4', 'BENCH5']
+
+
+def test_lineup_row_follows_slot_order():
+    assert lineup_row(make_roster(0)) == [f'P0_{j}' for j in range(len(ROLES))]
+
+
+def test_lineup_row_rejects_wrong_shape():
+    roster = make_roster(0)
+    with pytest.raises(ValueError):
+        lineup_row(roster[:-1])  # missing a bench player
+    roster[1]['Role'] = 'WR'  # three WRs, no RB
+    with pytest.raises(ValueError):
+        lineup_row(roster)
+
+
+def test_export_csv_writes_every_chunk():
+    out = io.StringIO()
+    written = export_csv((make_roster(i) for i in range(25)), out, chunk_size=10)
+
+    df = pd.read_csv(io.StringIO(out.getvalue()))
+    assert written == 25
+    assert list(df.columns) == SLOT_COLUMNS
+    assert len(df) == written
+    assert df.iloc[24].tolist() == lineup_row(make_roster(24))
+
+
+def test_export_parquet_row_group_per_chunk(tmp_path):
+    path = str(tmp_path / 'lineups.parquet')
+    written = export_parquet((make_roster(i) for i in range(25)), path, chunk_size=10)
+
+    parquet = pq.ParquetFile(path)
+    assert written == 25
+    assert parquet.metadata.num_rows == written
+    assert parquet.num_row_groups == 3
+    assert parquet.schema_arrow.names == SLOT_COLUMNS
@@ -0,0 +1,69 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from optimizer import FantasyOptimizer
+from player_pool import FLEX_POSITIONS, read_player_pool
+
+PLAYERS_CSV = os.path.join(os.path.dirname(__file__), 'players.csv')
+
+
+def make_optimizer(budget=200, min_budget=175, bench_max=10):
+    # Same settings the app uses
+    optimizer = FantasyOptimizer(read_player_pool(PLAYERS_CSV), budget)
+    optimizer.min_budget = min_budget
+    optimizer.bench_max = bench_max
+    optimizer.top_players_count = 0
+    return optimizer
+
+
+def assert_valid(team, min_budget, budget):
+    assert len(team) == 14
+    assert len({player['Name'] for player in team}) == 14
+    roles = pd.Series([player['Role'] for player in team]).value_counts().to_dict()
+    assert roles == {'QB': 1, 'RB': 1, 'WR': 2, 'TE': 1, 'K': 1, 'DEF': 1, 'FLEX': 2, 'BENCH': 5}
+    for player in team:
+        if player['Role'] in ('FLEX', 'BENCH'):
+            assert player['Position'] in FLEX_POSITIONS
+        else:
+            assert player['Position'] == player['Role']
+    assert min_budget < sum(player['Price'] for player in team) < budget
+
+
+def test_iter_teams_yields_distinct_valid_lineups_on_shipped_pool():
+    np.random.seed(0)
+    optimizer = make_optimizer()
+    teams = list(optimizer.iter_teams(50))
+
+    assert len(teams) == 50
+    assert len({frozenset(player['Name'] for player in team) for team in teams}) == 50
+    for team in teams:
+        assert_valid(team, 175, 200)
+
+
+def test_optimize_team_greedy_finds_a_team_on_shipped_pool():
+    np.random.seed(0)
+    team, cost = make_optimizer().optimize_team_greedy()
+
+    assert_valid(team, 175, 200)
+    assert cost == sum(player['Price'] for player in team)
+
+
+def test_iter_teams_stops_when_infeasible():
+    optimizer = make_optimizer(budget=10)
+    assert list(optimizer.iter_teams(1000)) == []
+
+
+def test_iter_teams_bounds_attempts():
+    optimizer = make_optimizer()
+    calls = []
+    build_candidate = optimizer.build_candidate
+
+    def counting_build_candidate(pool):
+        calls.append(1)
+        return build_candidate(pool)
+
+    optimizer.build_candidate = counting_build_candidate
+    list(optimizer.iter_teams(1000, max_attempts=30))
+    assert len(calls) == 30